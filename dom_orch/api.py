@@ -14,12 +14,144 @@
 
 import os
 import logging
+import threading
+import time
 
-from domino import Domino
-from domino import __version__
+from .helpers import orjson, parse_json
+
+# Note: python-domino and requests (along with their transitive dependencies) are imported
+# lazily, on first use of the API session. This keeps importing dom_orch cheap for code that
+# only builds or inspects execution graphs without talking to Domino.
 
 _TESTED_API_VERSION = "1.2.2"
 
+# Connection pool settings for the shared HTTP session
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+_MAX_RETRIES = 3
+_BACKOFF_FACTOR = 0.3
+# Transient responses (rate limiting, gateway errors) that are worth retrying
+_RETRY_STATUSES = (429, 502, 503, 504)
+
+# Number of seconds for which the list of global compute environments is reused. Environments
+# are added rarely, but long running pipelines should still pick them up.
+_GLOBAL_ENVS_TTL = 60.0
+
+# Maximum number of API requests in flight at the same time, across all tasks
+_MAX_CONCURRENT_REQUESTS = 16
+
+# Minimum number of runs due for a status update before the project's run list is fetched instead
+# of the individual run statuses. The run list covers every run the project has ever had, so it only
+# pays off when many runs are in flight.
+_BULK_STATUS_MIN_RUNS = 8
+
+
+class _RateLimiter(object):
+    """Thread-safe token bucket, which limits the average number of requests per second.
+
+    Up to one second worth of requests can be issued in a burst. Callers beyond that reserve a
+    token in advance and sleep until it becomes available, so they are served in order.
+
+    Parameters
+    ----------
+    rate : float
+            Maximum number of requests per second.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class _PooledRequestManager(object):
+    """Wraps the request manager of the Domino API session.
+
+    python-domino already issues all requests through a single requests.Session (request_session),
+    which carries its User-Agent, authentication, and certificate verification settings. This
+    wrapper keeps using that session, with a larger connection pool and retries of transient
+    errors mounted on it (see DominoAPISession._mount_pool()), so that the many concurrent
+    requests of a pipeline don't queue up for a handful of connections.
+
+    Parameters
+    ----------
+    request_manager : object
+            The original request manager of the Domino API session.
+    max_rps : float, default=None
+            Maximum number of requests per second. Not limited if not set.
+    """
+
+    def __init__(self, request_manager, max_rps=None):
+        self._request_manager = request_manager
+        self.session = request_manager.request_session
+
+        # Large pipelines can poll and submit many tasks at once. Bound the number of concurrent
+        # requests (and optionally the request rate), so that we don't get throttled by Domino.
+        self._semaphore = threading.BoundedSemaphore(_MAX_CONCURRENT_REQUESTS)
+        self._rate_limiter = _RateLimiter(max_rps) if max_rps else None
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self._request("POST", url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, json=None, **kwargs):
+        return self._request("PUT", url, data=data, json=json, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._request("DELETE", url, **kwargs)
+
+    def patch(self, url, data=None, json=None, **kwargs):
+        return self._request("PATCH", url, data=data, json=json, **kwargs)
+
+    def get_raw(self, url, **kwargs):
+        # Streamed download (e.g. blobs), returning the raw response body
+        return self._request("GET", url, stream=True, **kwargs).raw
+
+    def request(self, method, url, **kwargs):
+        return self._request(method.upper(), url, **kwargs)
+
+    def _request(self, method, url, **kwargs):
+        if orjson is not None and kwargs.get("json") is not None:
+            # Serialise JSON bodies with orjson, rather than letting requests use the json module
+            headers = dict(kwargs.get("headers") or {})
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+            kwargs["headers"] = headers
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        # Authenticate every request the same way python-domino does
+        kwargs.setdefault("auth", self._request_manager.auth)
+        with self._semaphore:
+            response = self.session.request(method, url, **kwargs)
+
+        # Keep the error handling of the original request manager (if any)
+        raise_for_status = getattr(self._request_manager, "_raise_for_status", None)
+        if raise_for_status:
+            raise_for_status(response)
+
+        return response
+
+    def __getattr__(self, name):
+        # Only non-HTTP attributes end up here. Every HTTP method is defined above, so that all
+        # requests are subject to the concurrency and rate limits.
+        return getattr(self._request_manager, name)
+
+
 class DominoAPISession(object):
     """Singleton that returns a connection to the target Domino instance.
 
@@ -35,6 +167,11 @@ class DominoAPISession(object):
     """
     
     _domino_api = None
+    _lock = threading.Lock()
+    _hw_tiers_cache = None
+    _project_hw_tiers_cache = None
+    _global_envs_cache = None
+    _global_envs_cached_at = None
 
     def __init__(self):
         raise RuntimeError("Call instance() instead")
@@ -42,18 +179,151 @@ class DominoAPISession(object):
     @classmethod
     def instance(cls):
 
-        if not cls._domino_api:
+        # Fast path, no locking once the session exists
+        if cls._domino_api is not None:
+            return cls._domino_api
+
+        DOMINO_USER_API_KEY = os.environ["DOMINO_USER_API_KEY"]
+        DOMINO_PROJECT_NAME = os.environ["DOMINO_PROJECT_NAME"]
+        DOMINO_PROJECT_OWNER = os.environ["DOMINO_PROJECT_OWNER"]
+
+        # Optional limit on the number of API requests per second
+        DOMINO_ORCH_MAX_RPS = os.environ.get("DOMINO_ORCH_MAX_RPS")
+        try:
+            max_rps = float(DOMINO_ORCH_MAX_RPS) if DOMINO_ORCH_MAX_RPS else None
+        except ValueError:
+            raise ValueError("DOMINO_ORCH_MAX_RPS must be a number. Got {0}".format(DOMINO_ORCH_MAX_RPS))
+        if max_rps is not None and not max_rps > 0:
+            raise ValueError("DOMINO_ORCH_MAX_RPS must be a positive number. Got {0}".format(DOMINO_ORCH_MAX_RPS))
+
+        with cls._lock:
 
-            if __version__ != _TESTED_API_VERSION:
-                log = logging.getLogger(__name__)
-                log.warn("Expected API version is {0} but the current Domino API version is {1}".format(_TESTED_API_VERSION, __version__))
+            # Another thread may have created the session while we were waiting for the lock
+            if cls._domino_api is None:
 
-            DOMINO_USER_API_KEY = os.environ["DOMINO_USER_API_KEY"]
-            DOMINO_PROJECT_NAME = os.environ["DOMINO_PROJECT_NAME"]
-            DOMINO_PROJECT_OWNER = os.environ["DOMINO_PROJECT_OWNER"]
+                from domino import Domino
+                from domino import __version__
 
-            cls._domino_api = Domino(
-                project=DOMINO_PROJECT_OWNER + "/" + DOMINO_PROJECT_NAME)
-            cls._domino_api.authenticate(api_key=DOMINO_USER_API_KEY)
+                if __version__ != _TESTED_API_VERSION:
+                    log = logging.getLogger(__name__)
+                    log.warning("Expected API version is %s but the current Domino API version is %s", _TESTED_API_VERSION, __version__)
+
+                domino_api = Domino(
+                    project=DOMINO_PROJECT_OWNER + "/" + DOMINO_PROJECT_NAME)
+                domino_api.authenticate(api_key=DOMINO_USER_API_KEY)
+
+                # Reuse connections across all API calls
+                cls._mount_pool(domino_api.request_manager.request_session)
+                domino_api.request_manager = _PooledRequestManager(domino_api.request_manager, max_rps=max_rps)
+
+                # Only publish the session once it is fully set up
+                cls._domino_api = domino_api
 
         return cls._domino_api
+
+    @staticmethod
+    def _mount_pool(session):
+        """Mounts a larger connection pool, which also retries transient errors, for both http and https
+        on an existing requests.Session. All other settings of the session are kept.
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE,
+                              max_retries=Retry(total=_MAX_RETRIES, backoff_factor=_BACKOFF_FACTOR,
+                                                status_forcelist=_RETRY_STATUSES,
+                                                # Back off for as long as a throttled (429/503) response asks us to
+                                                respect_retry_after_header=True,
+                                                # Hand the last response to the usual error handling
+                                                raise_on_status=False))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    @classmethod
+    def hardware_tiers(cls):
+        """Returns the hardware tiers available in the Domino instance.
+
+        The tier list is fetched once per session and cached, so repeated lookups don't
+        result in additional calls to the Domino API.
+
+        Returns
+        -------
+        hw_tiers : dict
+              Mapping of lower-cased hardware tier names to hardware tier IDs.
+        """
+        if cls._hw_tiers_cache is None:
+            hw_tiers = {}
+            for hardware_tier in cls.instance().hardware_tiers_list():
+                hw_tiers[hardware_tier["hardwareTier"]["name"].lower()] = hardware_tier["hardwareTier"]["id"]
+            cls._hw_tiers_cache = hw_tiers
+
+        return cls._hw_tiers_cache
+
+    @classmethod
+    def project_hardware_tiers(cls):
+        """Returns the hardware tiers available to the current project.
+
+        The response of the /v4/projects/{id}/hardwareTiers endpoint is cached for the
+        lifetime of the session.
+        """
+        if cls._project_hw_tiers_cache is None:
+            domino_api = cls.instance()
+            url = domino_api._routes.host + \
+                "/v4/projects/" + domino_api.project_id + "/hardwareTiers"
+            cls._project_hw_tiers_cache = parse_json(domino_api.request_manager.get(url))
+
+        return cls._project_hw_tiers_cache
+
+    @classmethod
+    def global_environments(cls):
+        """Returns the globally available compute environments.
+
+        The environment list is cached and shared by all tasks for _GLOBAL_ENVS_TTL seconds.
+
+        Returns
+        -------
+        list of dict : All compute environments with Global visibility.
+        """
+        now = time.monotonic()
+        if cls._global_envs_cache is None or now - cls._global_envs_cached_at >= _GLOBAL_ENVS_TTL:
+            # environments_list() can't filter server-side, so filter the response
+            all_available_environments = cls.instance().environments_list()
+            cls._global_envs_cache = [env for env in all_available_environments["data"]
+                                      if env.get("visibility") == "Global"]
+            cls._global_envs_cached_at = now
+
+        return cls._global_envs_cache
+
+    @classmethod
+    def runs_status_bulk(cls, run_ids):
+        """Fetches the status of multiple runs with a single API call.
+
+        python-domino has no endpoint for querying specific runs, so the runs of the project are
+        listed and filtered. The response is not cached, as run statuses change all the time.
+        The run list grows with every run the project has ever had, so it is only fetched for at
+        least _BULK_STATUS_MIN_RUNS runs. For fewer runs an empty dict is returned, and the runs
+        are queried individually.
+
+        Parameters
+        ----------
+        run_ids : collection of str
+              IDs of the runs to look up.
+
+        Returns
+        -------
+        dict : API status of each run, keyed by run ID. Runs missing from the project's run list
+               are left out, so the caller can query them individually.
+        """
+        if len(run_ids) < _BULK_STATUS_MIN_RUNS:
+            return {}
+
+        runs = cls.instance().runs_list().get("data", [])
+        return {run["id"]: run["status"] for run in runs if run["id"] in run_ids}
+
+    @classmethod
+    def invalidate(cls):
+        """Drops all cached API responses (e.g. hardware tiers). The session itself is kept.
+        """
+        cls._hw_tiers_cache = None
+        cls._project_hw_tiers_cache = None
+        cls._global_envs_cache = None
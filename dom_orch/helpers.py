@@ -12,8 +12,63 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from .api import DominoAPISession
-from tzlocal import get_localzone
+import random
+
+# Note: the API session and tzlocal are imported inside the functions that need them, so that
+# importing this module doesn't pull in python-domino or the timezone database.
+
+# orjson is optional. If it is installed, it is used to decode the (frequently polled) API
+# responses, as it is considerably faster than the json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_json(response):
+    """Decodes the JSON body of a Domino API response
+
+    Parameters
+    ----------
+    response : requests.Response
+            Response of a Domino API request.
+
+    Returns
+    -------
+    The decoded response body.
+    """
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
+
+def jittered_backoff(attempt, base=1.0, cap=30.0, factor=2.0, rng=random):
+    """Computes the delay before the next attempt of an exponential backoff
+
+    The delay is randomised by +/-50%, so that orchestrators (or tasks) that started at the same
+    time don't keep hitting the Domino API in lockstep.
+
+    Parameters
+    ----------
+    attempt : int
+            Number of attempts (e.g. polls without any change) so far, starting from 0.
+    base : float, default=1.0
+            Delay (in seconds) for the first attempt, before the randomisation.
+    cap : float, default=30.0
+            Maximum delay (in seconds).
+    factor : float, default=2.0
+            Growth factor of the delay per attempt.
+    rng : random.Random, default=random
+            Source of randomness. Callers that compute delays frequently can pass their own instance.
+
+    Returns
+    -------
+    delay : float
+            Number of seconds to wait.
+    """
+    # The exponent is bounded, as the delay is capped long before that anyway
+    delay = base * factor ** min(attempt, 64)
+    return min(cap, delay * rng.uniform(0.5, 1.5))
 
 
 def get_hardware_tier_id(tier_name):
@@ -32,11 +87,8 @@ def get_hardware_tier_id(tier_name):
     hw_tier_id = None
 
     if tier_name:
-        domino_api = DominoAPISession.instance()
-
-        for hardware_tier in domino_api.hardware_tiers_list():
-            if tier_name.lower() == hardware_tier["hardwareTier"]["name"].lower():
-                hw_tier_id = hardware_tier["hardwareTier"]["id"]
+        from .api import DominoAPISession
+        hw_tier_id = DominoAPISession.hardware_tiers().get(tier_name.lower())
 
     return hw_tier_id
 
@@ -50,14 +102,9 @@ def get_default_hardware_tier():
     hw_tier_id : str
               Domino hardware tier ID (e.g. small-k8s, large-k8s, gpu-small-k8s, etc.)
     """
-    domino_api = DominoAPISession.instance()
-    project_id = domino_api.project_id
+    from .api import DominoAPISession
+    result = DominoAPISession.project_hardware_tiers()
 
-    url = domino_api._routes.host + \
-                "/v4/projects/" + project_id + "/hardwareTiers"
-
-    result = domino_api.request_manager.get(url).json()
-    
     # As a fallback, select the first HW tier available to the project
     default_tier_id = result[0]["hardwareTier"]["id"]
 
@@ -68,7 +115,14 @@ def get_default_hardware_tier():
 
     return default_tier_id
 
+# Local timezone name, resolved on first use. It doesn't change during the lifetime of the process.
+_local_timezone = None
+
+
 def get_local_timezone():
     # Returns the local timezone
-    local_tz = get_localzone()
-    return str(local_tz)
+    global _local_timezone
+    if _local_timezone is None:
+        from tzlocal import get_localzone
+        _local_timezone = str(get_localzone())
+    return _local_timezone
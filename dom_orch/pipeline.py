@@ -13,12 +13,29 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import json
+import os
+import random
 import logging
-import time
+import re
+import threading
 import configparser
 
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11 - only configparser control files are supported
+    tomllib = None
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from .helpers import jittered_backoff
 from .tasks import DominoApp, DominoModel, DominoRun, DominoSchedRun, DominoTask
 
+# Separator for the task ids listed in the depends attribute (commas and/or whitespace)
+_DEP_RE = re.compile(r"[,\s]+")
+
 class Dag:
     """Dependency graph class.
 
@@ -33,37 +50,63 @@ class Dag:
             file produces a dependency graph that looks like this:
             ``{'job_1': [], 'job_2': [], 'job_3': [], 'sched_job_1': [], 'model_1': ['job_3'], 'app_1': ['model_1']}``
     allow_partial_failure : bool, default=False
-        If partial failures are allowed, the execution continues even if individual tasks fail.
+        If partial failures are allowed, the execution continues even if individual tasks fail. Their dependents
+        are skipped, and the pipeline ends in the DAG_PARTIALLY_SUCCEEDED state.
+    executor : concurrent.futures.Executor, default=None
+        Executor used for fetching task statuses concurrently. If not set, statuses are fetched
+        sequentially.
     """
     DAG_FAILED = "Failed"
     DAG_RUNNING = "Running"
     DAG_SUCCEEDED = "Succeeded"
+    DAG_PARTIALLY_SUCCEEDED = "Partially succeeded"
+
+    __slots__ = ("tasks", "dependency_graph", "allow_partial_failure", "executor", "ready_tasks", "failed_tasks",
+                 "_last_states", "states_changed", "dependents", "_remaining_deps", "_completed", "_active",
+                 "_skipped", "_priority", "log")
  
-    def __init__(self, tasks, dependency_graph, allow_partial_failure=False):
+    def __init__(self, tasks, dependency_graph, allow_partial_failure=False, executor=None):
         self.tasks = tasks
         self.dependency_graph = dependency_graph
         self.allow_partial_failure = allow_partial_failure
+        self.executor = executor
  
         self.ready_tasks = []
         self.failed_tasks = []
 
+        # Task states observed during the last update and whether any of them changed
+        self._last_states = {}
+        self.states_changed = False
+
+        # Reverse adjacency (task_id -> tasks depending on it) and number of unfinished
+        # dependencies per task. These let us schedule tasks incrementally (Kahn's algorithm)
+        # instead of re-evaluating the entire graph on every update.
+        self.dependents = {task_id: [] for task_id in dependency_graph}
+        for task_id, deps in dependency_graph.items():
+            for dep in deps:
+                self.dependents.setdefault(dep, []).append(task_id)
+        self._remaining_deps = {task_id: len(deps) for task_id, deps in dependency_graph.items()}
+
+        # Tasks that have succeeded, and the active frontier -- tasks whose dependencies have all
+        # succeeded, but which haven't succeeded or permanently failed themselves (insertion ordered).
+        # Tasks enter the frontier as their dependencies complete, so blocked tasks are never polled.
+        self._completed = set()
+        self._active = dict.fromkeys(task_id for task_id in tasks if not self._remaining_deps.get(task_id))
+
+        # Tasks that will never run, because one of their (transitive) dependencies has permanently failed
+        self._skipped = set()
+
+        # Scheduling priority of each task (computed on first update)
+        self._priority = None
+
         self.log = logging.getLogger(__name__)
  
-    def get_dependency_statuses(self, task_id):
-        """
-        Returns a list of statuses for all dependencies for a given task_id.
-        This enables us to check if all prerequisites for a task have been completed so
-        the task itself can be scheduled. 
-        """
-        dependency_statuses = []
-        deps = self.dependency_graph[task_id]
-        for dep in deps:
-            dependency_statuses += [self.tasks[dep].status()]
-        return dependency_statuses
- 
     def are_task_dependencies_complete(self, task_id):
         """Check if all task dependencies have completed successfully.
 
+        The number of unfinished dependencies of each task is maintained incrementally by
+        update_tasks_states(), so this is a constant time lookup and makes no API calls.
+
         Parameters
         ----------
         task_id : str
@@ -72,17 +115,8 @@ class Dag:
         Returns
         -------
         bool : True if all dependent tasks have completed with DominoTask.STAT_SUCCEEDED status.
-    
-        See Also
-        --------
-        get_dependency_statuses : list of statuses for all dependencies
         """
-        dependency_statuses = self.get_dependency_statuses(task_id)
-        if dependency_statuses:
-            all_deps_succeeded = all(status == DominoTask.STAT_SUCCEEDED for status in dependency_statuses)
-        else:
-            all_deps_succeeded = True
-        return all_deps_succeeded
+        return self._remaining_deps[task_id] == 0
  
     def get_ready_tasks(self):
         """Returns a list of tasks that are ready for execution.
@@ -94,9 +128,43 @@ class Dag:
         """
         return self.failed_tasks
  
+    def refresh_all_statuses(self, task_ids=None):
+        """Fetches the status of all tasks in the DAG.
+
+        Tasks are grouped by type and each group issues a single batch status call (where
+        the task type supports it) instead of one API call per task. The fetched statuses are
+        cached on the tasks, so calling task.status() right after the refresh doesn't hit the API.
+
+        Parameters
+        ----------
+        task_ids : iterable of str, default=None
+            Restricts the refresh to the given tasks. All tasks are refreshed if not set.
+
+        Returns
+        -------
+        all_states : dict
+            The current status of each task, keyed by task_id.
+
+        See Also
+        --------
+        DominoTask.status_batch : fetches the status of multiple tasks
+        """
+        if task_ids is None:
+            tasks = self.tasks
+        else:
+            tasks = {task_id: self.tasks[task_id] for task_id in task_ids}
+
+        return DominoTask.status_batch(tasks.values(), executor=self.executor)
+
     def update_tasks_states(self):
         """Updates the status of all tasks in the DAG.
 
+        Only the active frontier is polled, i.e. tasks whose dependencies have succeeded, but
+        which haven't succeeded or permanently failed yet. When a task succeeds, the dependency
+        counters of its dependents are decremented, and a dependent joins the frontier (and
+        becomes ready) once all of its dependencies have succeeded. When a task permanently
+        fails, all of its (transitive) dependents are skipped, as they can never run.
+
         Returns
         -------
         failed_tasks : a list of DominoTask
@@ -104,61 +172,254 @@ class Dag:
         ready_tasks : a list of DominoTask
             Tasks that are ready for execution
 
+        The states_changed attribute is set to True if any task has transitioned to a
+        different state since the previous update.
+
         See Also
         --------
         See the :DominoTask:'dom_orch.tasks.DominoTask' class.
         """        
-        self.failed_tasks = []
         self.ready_tasks = []
         all_tasks = self.tasks
-        all_states = {}
- 
-        for task_id, task in all_tasks.items():
-            all_states[task_id] = task.status()
- 
-        for task_id in all_states:
-            status = all_states[task_id]
+        active_states = self.refresh_all_statuses(self._active)
+
+        # Log all states in a single record. The message is only built if INFO is enabled.
+        if self.log.isEnabledFor(logging.INFO):
+            self.log.info("Task states:\n%s", "\n".join("task_id: {0:15} status:{1}".format(task_id, status)
+                                                         for task_id, status in active_states.items()))
+
+        # Single pass over the frontier. All of its tasks have their dependencies met, so a task
+        # is ready if it hasn't been submitted yet, or if it has failed and can be retried.
+        self.states_changed = False
+        unblocked = []
+        for task_id, status in active_states.items():
             task = all_tasks[task_id]
-            self.log.info("task_id: {0:15} status:{1}".format(task_id, status))
-    
-            # Check for failed tasks
-            if status == DominoTask.STAT_FAILED and task.retries >= task.max_retries:
-                self.failed_tasks.append(task)
- 
-            # Check for ready tasks
-            deps_complete = self.are_task_dependencies_complete(task_id)
-            task_status_ready = (status == DominoTask.STAT_FAILED and task.retries < task.max_retries) or (status == DominoTask.STAT_UNSUBMITTED)
-            if deps_complete and task_status_ready:
+
+            if self._last_states.get(task_id) is not status:
+                self.states_changed = True
+                self._last_states[task_id] = status
+
+            if status is DominoTask.STAT_SUCCEEDED:
+                # Task is done, release its dependents
+                del self._active[task_id]
+                self._completed.add(task_id)
+                for dependent in self.dependents[task_id]:
+                    self._remaining_deps[dependent] -= 1
+                    if self._remaining_deps[dependent] == 0:
+                        self._active[dependent] = None
+                        unblocked.append(dependent)
+
+            elif status is DominoTask.STAT_FAILED:
+                if not task.can_retry:
+                    # Retries exhausted
+                    del self._active[task_id]
+                    self.failed_tasks.append(task)
+                    self._skip_dependents(task_id)
+                else:
+                    self.ready_tasks.append(task)
+
+            elif status is DominoTask.STAT_UNSUBMITTED:
                 self.ready_tasks.append(task)
+
+        # Tasks that have just joined the frontier haven't been polled yet
+        for task_id in unblocked:
+            task = all_tasks[task_id]
+            if task.status() is DominoTask.STAT_UNSUBMITTED:
+                self.ready_tasks.append(task)
+
+        # Submit the tasks with the longest chain of dependents first
+        if self._priority is None:
+            self._priority = self._compute_priorities()
+        self.ready_tasks.sort(key=lambda task: -self._priority[task.task_id])
  
         return self.failed_tasks, self.ready_tasks            
+
+    def _skip_dependents(self, task_id):
+        """Marks all (transitive) dependents of a permanently failed task as skipped.
+        """
+        skipped = []
+        pending = list(self.dependents[task_id])
+        while pending:
+            dependent = pending.pop()
+            if dependent in self._skipped:
+                continue
+            self._skipped.add(dependent)
+            skipped.append(dependent)
+            pending.extend(self.dependents[dependent])
+
+        if skipped:
+            self.log.warning("Task %s has failed. Skipping its dependent task(s): %s", task_id,
+                             ", ".join(sorted(skipped)))
  
     def pipeline_status(self):
         """Get the pipeline status.
 
+        The status is derived from the outcome of the last call to update_tasks_states(), so no
+        additional API calls are made.
+
         Returns
         -------
 
-        str: {DAG_RUNNING, DAG_FAILED, DAG_SUCCEEDED}
+        str: {DAG_RUNNING, DAG_FAILED, DAG_SUCCEEDED, DAG_PARTIALLY_SUCCEEDED}
             DAG_RUNNING - the pipeline is running
             DAG_FAILED - the pipeline has failed
             DAG_SUCCEEDED - the pipeline has completed successfully
+            DAG_PARTIALLY_SUCCEEDED - the pipeline has completed, but some tasks have failed or were
+                                      skipped (only if allow_partial_failure is set)
         """
-        status = self.DAG_RUNNING
- 
         if len(self.get_failed_tasks()) > 0 and self.allow_partial_failure == False:
-            status = self.DAG_FAILED
-        elif all(task.is_complete() for task_id, task in self.tasks.items()):
-            status = self.DAG_SUCCEEDED
-        return status
+            return self.DAG_FAILED
+
+        # Every task has either succeeded, permanently failed, or been skipped because of a failure
+        if len(self._completed) + len(self.failed_tasks) + len(self._skipped) == len(self.tasks):
+            if self.failed_tasks or self._skipped:
+                return self.DAG_PARTIALLY_SUCCEEDED
+            return self.DAG_SUCCEEDED
+
+        return self.DAG_RUNNING
     
     def validate_dag(self):
-        """
-        TODO: Implement graph validation. Make sure that:
-              * The graph is not cyclic
+        """Validates the graph structure. Makes sure that:
               * All task names are unique
+              * Every task is in the dependency graph, and vice versa
+              * All dependencies refer to existing tasks
+              * The graph is not cyclic
+
+        Cycles are detected using Kahn's algorithm -- tasks are repeatedly removed from the graph
+        once all their dependencies have been removed. If some tasks are never removed, they
+        are part of (or depend on) a cycle, and Tarjan's algorithm is used for reporting the
+        actual cycles.
+
+        Raises
+        ------
+        ValueError
+            If the graph is not valid.
+        """
+        task_ids = [task.task_id for task in self.tasks.values()]
+        if len(set(task_ids)) != len(task_ids):
+            raise ValueError("Task ids in the execution graph are not unique.")
+
+        missing = set(self.tasks) - set(self.dependency_graph)
+        extra = set(self.dependency_graph) - set(self.tasks)
+        if missing or extra:
+            raise ValueError("Tasks don't match the dependency graph. Missing from the graph: {0}. "
+                             "Not defined as tasks: {1}".format(", ".join(sorted(missing)) or "none",
+                                                                ", ".join(sorted(extra)) or "none"))
+
+        unknown_deps = set(dep for deps in self.dependency_graph.values() for dep in deps) - set(self.dependency_graph)
+        if unknown_deps:
+            raise ValueError("Unknown task(s) listed as dependencies: {0}".format(", ".join(sorted(unknown_deps))))
+
+        self._topological_order()
+
+    def _topological_order(self):
+        """Sorts the tasks topologically using Kahn's algorithm.
+
+        Returns
+        -------
+        list of str : Task ids ordered so that every task comes after all of its dependencies.
+
+        Raises
+        ------
+        ValueError
+            If the graph contains a cycle.
+        """
+        in_degree = {task_id: sum(1 for dep in deps if dep in self.dependency_graph)
+                     for task_id, deps in self.dependency_graph.items()}
+        queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in self.dependents[task_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(order) < len(in_degree):
+            # Pinpoint the cycles among the tasks that couldn't be ordered
+            cycles = self._find_cycles([task_id for task_id, degree in in_degree.items() if degree > 0])
+            raise ValueError("Cycle detected in the execution graph between tasks: {0}".format(
+                "; ".join(", ".join(cycle) for cycle in cycles)))
+
+        return order
+
+    def _find_cycles(self, task_ids):
+        """Finds the cycles among the given tasks using (an iterative version of) Tarjan's strongly
+        connected components algorithm.
+
+        Parameters
+        ----------
+        task_ids : list of str
+            Tasks to examine. Dependencies on tasks outside of this list are ignored.
+
+        Returns
+        -------
+        list of lists of str : One list of task ids per cycle, i.e. per strongly connected component
+            with more than one task, or a single task depending on itself.
         """
-        pass
+        graph = self.dependency_graph
+        nodes = set(task_ids)
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+
+        for root in task_ids:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+
+            while work:
+                task_id, deps = work[-1]
+                for dep in deps:
+                    if dep not in nodes:
+                        continue
+                    if dep not in index:
+                        # Descend into the dependency, and resume with the remaining ones afterwards
+                        index[dep] = lowlink[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(graph[dep])))
+                        break
+                    if dep in on_stack:
+                        lowlink[task_id] = min(lowlink[task_id], index[dep])
+                else:
+                    # All dependencies visited
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[task_id])
+
+                    if lowlink[task_id] == index[task_id]:
+                        # task_id is the root of a strongly connected component
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == task_id:
+                                break
+                        if len(component) > 1 or task_id in graph[task_id]:
+                            cycles.append(component[::-1])
+
+        return cycles
+
+    def _compute_priorities(self):
+        """Computes the scheduling priority of each task as the length of the longest chain of
+        tasks depending on it. Submitting tasks on the critical path first shortens the overall
+        pipeline execution time when the number of concurrent executions is limited.
+        """
+        priority = {}
+        for task_id in reversed(self._topological_order()):
+            priority[task_id] = max((priority[dependent] + 1 for dependent in self.dependents[task_id]), default=0)
+        return priority
   
     def get_tasks(self):
         """Get a list of all tasks in the graph
@@ -174,13 +435,20 @@ class Dag:
         """
         return self.tasks
  
+    def to_dict(self):
+        """Get the structure of the graph
+
+        Returns
+        -------
+        dict : {'task_id': [task_class_name, [dependencies]], ...}
+            The task type and dependencies of each task in the DAG.
+        """
+        dependency_graph = self.dependency_graph
+        return {task_id: [type(task).__name__, list(dependency_graph.get(task_id, ()))]
+                for task_id, task in self.tasks.items()}
+
     def __str__(self):
-        dict_3 = {**self.tasks, **self.dependency_graph}
-        for key, value in dict_3.items():
-            if key in self.tasks and key in self.dependency_graph:
-               dict_3[key] = [self.tasks[key].__class__.__name__, value]
- 
-        return json.dumps(dict_3, indent=2)
+        return json.dumps(self.to_dict(), indent=2)
 
 class PipelineRunner:
     """Responsible for running a pipeline based on the DAG structure.
@@ -190,33 +458,93 @@ class PipelineRunner:
     dag : Dag
         The execution graph.
     tick_freq : int, default=15
-        Number of seconds to wait between checking the status of the execution graph.
-        The default is 15 seconds.
+        Maximum number of seconds to wait between checking the status of the execution graph.
+        The runner wakes up earlier whenever a task succeeds or fails. The default is 15 seconds.
+    min_tick_freq : int, default=2
+        Number of seconds to wait between checks right after a task has changed its state.
+        While nothing changes the wait time grows by backoff_factor until it reaches tick_freq.
+        The wait times are randomised by +/-50% (capped at tick_freq), so that runners started at
+        the same time don't poll the Domino API in lockstep.
+    backoff_factor : float, default=1.5
+        Multiplier applied to the wait time after each check that observed no state changes.
+    executor : concurrent.futures.Executor, default=None
+        Executor used for submitting tasks and fetching their statuses concurrently. If not set,
+        a ThreadPoolExecutor with one worker per task (up to 32 workers) is created for each call
+        to run(), and shut down once the run ends. The executor is also shared with the DAG for
+        the duration of the run, unless the DAG already has one.
 
     See Also
     --------
     See the :Dag:'dom_orch.pipeline.Dag' class.
     """
-    def __init__(self, dag, tick_freq=15):
+    def __init__(self, dag, tick_freq=15, min_tick_freq=2, backoff_factor=1.5, executor=None):
         self.dag = dag
         self.tick_freq = tick_freq
+        self.min_tick_freq = min(min_tick_freq, tick_freq)
+        self.backoff_factor = backoff_factor
+
+        self.executor = executor
+
+        # Private random generator for the polling jitter
+        self._rng = random.Random()
+
+        # Set when a task reaches a terminal state, so that the runner can react without waiting for the next tick
+        self._wake = threading.Event()
+        for task in self.dag.get_tasks().values():
+            task.on_status_change = self._on_task_status_change
 
         self.log = logging.getLogger(__name__)
+
+    def _on_task_status_change(self, task, old_status, new_status):
+        """Wakes up the runner when a task succeeds or fails, as this may unblock other tasks
+        or complete the pipeline.
+        """
+        if new_status is DominoTask.STAT_SUCCEEDED or new_status is DominoTask.STAT_FAILED:
+            self._wake.set()
  
     def run(self):
         """Starts and operates the graph execution cycle
         """
+        executor = self.executor
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=min(32, max(1, len(self.dag.get_tasks()))))
+
+        share_executor = self.dag.executor is None
+        if share_executor:
+            self.dag.executor = executor
+
+        try:
+            self._run(executor)
+        finally:
+            if share_executor:
+                self.dag.executor = None
+            if executor is not self.executor:
+                # Don't leak the worker threads of the executor created for this run
+                executor.shutdown()
+
+    def _run(self, executor):
         # Loop until failure or until everything has been executed
         self.log.info("Starting the pipeline...")
+
+        # Number of consecutive checks that observed no changes
+        idle_ticks = 0
  
         while True:
-            
             failed_tasks, ready_tasks = self.dag.update_tasks_states()
             pipeline_status = self.dag.pipeline_status()
+
+            # The transitions observed by the poll above are handled by this iteration, so they must
+            # not cut the next wait short. Only changes from here on (e.g. failed submissions, or
+            # tasks updated from other threads) wake the runner early.
+            self._wake.clear()
  
             if pipeline_status == Dag.DAG_SUCCEEDED:
                 # Pipeline completed successfully
                 break
+            elif pipeline_status == Dag.DAG_PARTIALLY_SUCCEEDED:
+                self.log.warning("Pipeline completed with failed task(s): %s",
+                                 ", ".join(task.task_id for task in failed_tasks))
+                break
             elif pipeline_status == Dag.DAG_FAILED:
                 #for task in failed_tasks:
                 #    self.log.error("Failed task detected. task_id: {0}\t status: {1}".format(task.task_id, task.status()))
@@ -226,15 +554,20 @@ class PipelineRunner:
             if len(ready_tasks) == 0:
                 self.log.info("Waiting for executions or new tasks...")
             else:
-                self.log.info("Task(s) ready for submission: {0}".format(", ".join([task.task_id for task in ready_tasks])))
+                self.log.info("Task(s) ready for submission: %s", ", ".join(task.task_id for task in ready_tasks))
  
             # Submit all tasks that are ready
-            for task in ready_tasks:
-                response_json = task.submit()
-                #print(json.dumps(response_json, indent=2))
-                #print(20*"-")
+            DominoTask.submit_many(ready_tasks, executor=executor)
+
+            # Poll frequently while the pipeline is active and back off while it is idle
+            if self.dag.states_changed or ready_tasks:
+                idle_ticks = 0
+            else:
+                idle_ticks += 1
+            current_interval = jittered_backoff(idle_ticks, base=self.min_tick_freq, cap=self.tick_freq,
+                                                factor=self.backoff_factor, rng=self._rng)
  
-            time.sleep(self.tick_freq)
+            self._wake.wait(timeout=current_interval)
  
         #print("Pipeline completed. Status: {}".format(pipeline_status))
  
@@ -244,10 +577,14 @@ class DagBuilder:
 
     Parameters
     ----------
-    control_file : str
+    control_file : str, file-like object, or configparser.ConfigParser
         A control file containing an execution graph. The structure of the control file follows a dictionary/attributes paradigm.
         Each task has a unique id (str), which is used for describing relationships (dependencies). The valid task types
         are {run, model, app}
+        Besides a path, the control file can be passed as an open file (or any other object with a read() method, e.g.
+        io.StringIO), or as an already parsed ConfigParser. The latter avoids re-parsing when the same DAG is rebuilt.
+        Paths ending in .toml are parsed as TOML (requires Python 3.11+), with one table per task. In TOML files depends
+        can also be an array, and boolean and integer attributes can use native TOML values.
 
     Returns
     -------
@@ -257,6 +594,7 @@ class DagBuilder:
     See Also
     --------
     * The configuration file parser - `configparser <https://docs.python.org/3/library/configparser.html>`_.
+    * The TOML parser - `tomllib <https://docs.python.org/3/library/tomllib.html>`_.
 
     * The :Dag:'dom_orch.pipeline.Dag' class.
 
@@ -301,134 +639,173 @@ class DagBuilder:
     def __init__(self, control_file):
         self.control_file = control_file
 
+    def _parse_control_file(self):
+        """Parses the control file into a dict of {task_id: {attribute: value}}.
+        """
+        if isinstance(self.control_file, configparser.ConfigParser):
+            # Already parsed
+            c = self.control_file
+        elif not hasattr(self.control_file, "read") and os.fsdecode(self.control_file).lower().endswith(".toml"):
+            if tomllib is None:
+                raise ValueError("TOML control files require Python 3.11 or newer.")
+            with open(self.control_file, "rb") as f:
+                sections = tomllib.load(f)
+            for task_id, section in sections.items():
+                if not isinstance(section, dict):
+                    raise ValueError("{0} is not a valid task definition. Each task must be a TOML table.".format(task_id))
+            return sections
+        else:
+            c = configparser.ConfigParser(allow_no_value=True)
+            if hasattr(self.control_file, "read"):
+                c.read_file(self.control_file)
+            else:
+                c.read(self.control_file)
+
+        # Take a snapshot of each section instead of querying the parser for each option.
+        # Values are taken as-is, so commands can contain % characters (e.g. date formats).
+        return {task_id: dict(c.items(task_id, raw=True)) for task_id in c.sections()}
+
     def build_dag(self):
- 
-        # Valid task types
-        task_types = ["run", "app", "model"]
-    
-        # Parse the configuration file
-        c = configparser.ConfigParser(allow_no_value=True)
-        c.read(self.control_file)
+
+        sections = self._parse_control_file()
+
+        # Valid task types and their respective builders
+        task_builders = {"run": self._build_run, "model": self._build_model, "app": self._build_app}
     
         # Build dependency graph
         tasks = {}
         dependency_graph = {}
-        task_ids = c.sections()
     
-        for task_id in task_ids:
+        for task_id, section in sections.items():
     
             # Check for task dependencies
-            if c.has_option(task_id, "depends"):
-                dependencies_str = c.get(task_id, "depends")
-                dependencies = dependencies_str.split()
-            else:
-                dependencies = []
-            dependency_graph[task_id] = dependencies
+            dependencies = section.get("depends") or ""
+            if isinstance(dependencies, str):
+                dependencies = _DEP_RE.split(dependencies.strip())
+            # Dependencies never change once the graph is built, so store them as immutable tuples
+            dependency_graph[task_id] = tuple(dep for dep in dependencies if dep)
     
-            # HW tier set?
-            domino_run_kwargs = {}
-            if c.has_option(task_id, "tier"):
-                tier = c.get(task_id, "tier")
-                domino_run_kwargs["tier"] = tier
+            # If no task type is set we assume it's a job
+            task_type = (section.get("type") or "run").lower()
+
+            if task_type not in task_builders:
+                raise ValueError("{0} is not a valid task type. Must be one of {1}".format(task_type, list(task_builders)))
+
+            tasks[task_id] = task_builders[task_type](task_id, section)
     
-            # Task type set?
-            if c.has_option(task_id, "type"):
-                task_type = c.get(task_id, "type").lower()
-            else:
-                # If no task type is set we assume it's a job
-                task_type = "run"
-            
-            if task_type == "run":
-                # Task is a job
-                # Direct command?
-                if c.has_option(task_id, "direct"):
-                    isDirect = c.get(task_id, "direct").lower() == "true"
-                else:
-                    isDirect = False
-                
-                command_str = c.get(task_id, "command")
-                if isDirect or c.has_option(task_id, "cron_string"): 
-                    command = [command_str]
-                else:
-                    command = command_str.split()
+        dag = Dag(tasks, dependency_graph)
 
-                # Retries required?
-                if c.has_option(task_id, "max_retries"):
-                    max_retries = c.get(task_id, "max_retries")
-                    domino_run_kwargs["max_retries"] = max_retries
+        # Fail fast on invalid graphs (a cycle would otherwise keep the pipeline polling forever)
+        dag.validate_dag()
 
-                if c.has_option(task_id, "title"):
-                    title = c.get(task_id, "title")
-                    domino_run_kwargs["title"] = title
+        # Resolve hardware tier names now (the tier list is fetched once and cached), so that misspelled
+        # tiers fail the build instead of individual submissions
+        for task in tasks.values():
+            task.resolve_hardware_tier()
 
-                # Is it a scheduled job?
-                if c.has_option(task_id, "cron_string"):
-                    cron_string = c.get(task_id, "cron_string")
+        return dag
 
-                    # Check for user override
-                    if c.has_option(task_id, "submit_as_running_user"):
-                         domino_run_kwargs["submit_as_running_user"] = c.get(task_id, "submit_as_running_user").lower() == "true"
+    def _build_run(self, task_id, section):
+        # Task is a job
+        if not section.get("command"):
+            raise ValueError("Command is a mandatory field for a run task.")
 
-                    # Deploying by name?
-                    if c.has_option(task_id, "deploy_by_name"):
-                        domino_run_kwargs["deploy_by_name"] = c.get(task_id, "deploy_by_name").lower() == "true"
+        command_str = section["command"]
 
-                    tasks[task_id] = DominoSchedRun(task_id, command, cron_string, **domino_run_kwargs)
+        # Is it a scheduled job?
+        if "cron_string" in section:
+            # Scheduled jobs are always direct
+            return DominoSchedRun(task_id, [command_str], section["cron_string"], **self._sched_run_kwargs(section))
 
-                else:
-                    tasks[task_id] = DominoRun(task_id, command, isDirect=isDirect, **domino_run_kwargs)
-    
-            elif task_type == "model":
-                # Task is a model deployment
-                if c.has_option(task_id, "name"):
-                    model_name = c.get(task_id, "name")
-                else:
-                    # if there is no model name just use the task_id
-                    model_name = task_id
-    
-                model_id = None
-                if c.has_option(task_id, "model_id"):
-                    model_id = c.get(task_id, "model_id")
-    
-                environment = None
-                if c.has_option(task_id, "environment"):
-                    environment = c.get(task_id, "environment")
-    
-                deploy_by_name = False
-                if c.has_option(task_id, "deploy_by_name"):
-                    deploy_by_name = bool(c.get(task_id, "deploy_by_name"))
+        kwargs = self._run_kwargs(task_id, section)
+        if kwargs["isDirect"]:
+            command = [command_str]
+        else:
+            command = command_str.split()
 
-                model_description = None
-                if c.has_option(task_id, "description"):
-                    model_description = c.get(task_id, "description")
-    
-                if (c.has_option(task_id, "file") and c.has_option(task_id, "function")):
-                        file_name = c.get(task_id, "file")
-                        function = c.get(task_id, "function")
-                else:
-                    raise ValueError("File and function are mandatory fields for a Model API task.")
+        return DominoRun(task_id, command, **kwargs)
 
-                tasks[task_id] = DominoModel(task_id, file_name, function, model_name, model_description, model_id, environment, deploy_by_name)
-                
-            elif task_type == "app":
-                # Task is an app deployment
-                domino_run_kwargs = {}
-                
-                app_name = task_id # Use task_id as the defualt app name
-                if c.has_option(task_id, "name"):
-                    app_name = c.get(task_id, "name")
-    
-                if c.has_option(task_id, "tier"):
-                    tier = c.get(task_id, "tier")
-                    domino_run_kwargs["tier"] = tier
-    
-                if c.has_option(task_id, "description"):
-                    description = c.get(task_id, "description")
-                    domino_run_kwargs["description"] = description
+    def _build_model(self, task_id, section):
+        # Task is a model deployment
+        return DominoModel(task_id, **self._model_kwargs(task_id, section))
 
-                tasks[task_id] = DominoApp(task_id, app_name, **domino_run_kwargs)
-    
-            else:
-                raise ValueError("{0} is not a valid task type. Must be one of {1}".format(task_type, task_types))
-    
-        return Dag(tasks, dependency_graph)        
\ No newline at end of file
+    def _build_app(self, task_id, section):
+        # Task is an app deployment
+        return DominoApp(task_id, **self._app_kwargs(task_id, section))
+
+    def _run_kwargs(self, task_id, section):
+        # HW tier, retries, and title are optional
+        kwargs = _optional_kwargs(section, "tier", "max_retries", "title")
+
+        # Retries are compared against a counter on every update, so convert them once here
+        if "max_retries" in kwargs:
+            try:
+                kwargs["max_retries"] = int(kwargs["max_retries"])
+            except (TypeError, ValueError):
+                raise ValueError("max_retries for task {0} must be an integer. Got {1}".format(task_id, kwargs["max_retries"]))
+
+        # Direct command?
+        kwargs["isDirect"] = _as_bool(section.get("direct"))
+
+        return MappingProxyType(kwargs)
+
+    def _sched_run_kwargs(self, section):
+        kwargs = _optional_kwargs(section, "tier", "title")
+
+        # Check for user override
+        if "submit_as_running_user" in section:
+            kwargs["submit_as_running_user"] = _as_bool(section["submit_as_running_user"])
+
+        # Deploying by name?
+        if "deploy_by_name" in section:
+            kwargs["deploy_by_name"] = _as_bool(section["deploy_by_name"])
+
+        return MappingProxyType(kwargs)
+
+    def _model_kwargs(self, task_id, section):
+        if not ("file" in section and "function" in section):
+            raise ValueError("File and function are mandatory fields for a Model API task.")
+
+        return MappingProxyType({
+            "file_name": section["file"],
+            "function_name": section["function"],
+            # If there is no model name just use the task_id
+            "model_name": section.get("name", task_id),
+            "description": section.get("description"),
+            "model_id": section.get("model_id"),
+            "environment_id": section.get("environment"),
+            "deploy_by_name": _as_bool(section.get("deploy_by_name"))
+        })
+
+    def _app_kwargs(self, task_id, section):
+        kwargs = _optional_kwargs(section, "tier", "description")
+
+        # Use task_id as the default app name
+        kwargs["app_name"] = section.get("name", task_id)
+
+        return MappingProxyType(kwargs)
+
+
+def _optional_kwargs(section, *options):
+    """Returns the options that are present in a control file section as a dict of keyword arguments.
+    """
+    return {option: section[option] for option in options if option in section}
+
+
+def _as_bool(value):
+    """Interprets a control file value (e.g. "true", "yes", "on", "1") as a boolean.
+    Missing values are treated as False.
+    """
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        # Native TOML boolean
+        return value
+    if isinstance(value, int):
+        # Native TOML integer
+        if value not in (0, 1):
+            raise ValueError("Expected a boolean value (0 or 1). Got {0}".format(value))
+        return value == 1
+    if not isinstance(value, str):
+        raise ValueError("Expected a boolean value. Got {0!r}".format(value))
+    return configparser.ConfigParser.BOOLEAN_STATES.get(value.strip().lower(), False)
@@ -15,14 +15,19 @@
 import logging
 import time
 import os
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
 from .api import DominoAPISession
-from .helpers import get_default_hardware_tier, get_hardware_tier_id, get_local_timezone
-from abc import abstractmethod
-from abc import ABCMeta
+from .helpers import get_default_hardware_tier, get_hardware_tier_id, get_local_timezone, jittered_backoff, parse_json
+
+# Closes the log output of a submission
+_DIVIDER = 20 * "-"
 
 
-class DominoTask(metaclass=ABCMeta):
+class DominoTask:
     """This is the base class for all tasks run by the orchestrator. 
 
     It translates the API states to four internal states - un-submitted, in progress, succeeded, and failed.
@@ -34,36 +39,328 @@ class DominoTask(metaclass=ABCMeta):
     task_id : str
             Task name (unique id).
     """
-    STAT_UNSUBMITTED = "Unsubmitted"
-    STAT_SUCCEEDED = "Succeeded"
-    STAT_INPROGRESS = "In-progress"
-    STAT_FAILED = "Failed"
-
-    VALID_STATES = [STAT_UNSUBMITTED,
-                    STAT_SUCCEEDED, STAT_INPROGRESS, STAT_FAILED]
+    # Statuses are interned, so they can be compared by identity
+    STAT_UNSUBMITTED = sys.intern("Unsubmitted")
+    STAT_SUCCEEDED = sys.intern("Succeeded")
+    STAT_INPROGRESS = sys.intern("In-progress")
+    STAT_FAILED = sys.intern("Failed")
+
+    VALID_STATES = frozenset((STAT_UNSUBMITTED,
+                              STAT_SUCCEEDED, STAT_INPROGRESS, STAT_FAILED))
+
+    # Allowed status transitions (setting the current status again is always allowed). Succeeded is
+    # final, while a failed task can be resubmitted (retries) or reset.
+    TRANSITIONS = MappingProxyType({
+        STAT_UNSUBMITTED: frozenset((STAT_INPROGRESS, STAT_SUCCEEDED, STAT_FAILED)),
+        STAT_INPROGRESS: frozenset((STAT_SUCCEEDED, STAT_FAILED)),
+        STAT_SUCCEEDED: frozenset(),
+        STAT_FAILED: frozenset((STAT_UNSUBMITTED, STAT_INPROGRESS)),
+    })
+
+    # Bounds (in seconds) of the adaptive status polling interval. A status fetched from the Domino API
+    # is considered current for the length of the interval. The interval is halved whenever the status
+    # changes and grows while it doesn't, so slow tasks are polled less often. Subclasses override the
+    # bounds to match how long their executions typically take.
+    MIN_POLL_INTERVAL = 1.0
+    MAX_POLL_INTERVAL = 15.0
+
+    # Whether submit_many() must submit tasks of this type one at a time, rather than in parallel
+    SERIAL_SUBMISSION = False
+
+    # All tasks share the module logger
+    log = logging.getLogger(__name__)
+
+    # Tasks are long-lived and numerous, so avoid a per-instance __dict__
+    __slots__ = ("task_id", "_status", "_cached_at", "_poll_interval", "on_status_change", "max_retries",
+                 "retries", "can_retry", "domino_api", "_etag")
 
     def __init__(self, task_id):
         self.task_id = task_id
         self._status = self.STAT_UNSUBMITTED
 
-        # By default all tasks are attempted only once
+        # Time (monotonic) of the last status update received from the Domino API, and the number of
+        # seconds until the next one is due
+        self._cached_at = None
+        self._poll_interval = self.MIN_POLL_INTERVAL
+
+        # ETag of the last status response, used for conditional status requests
+        self._etag = None
+
+        # Optional callable(task, old_status, new_status), invoked whenever the status changes
+        self.on_status_change = None
+
+        # By default all tasks are attempted only once. can_retry is kept in sync with the
+        # counters, so that the scheduler doesn't have to compare them on every update.
         self.max_retries = 0
         self.retries = 0
+        self.can_retry = False
 
+        # All API calls of all tasks go through the request manager of this shared session,
+        # which reuses pooled connections (see DominoAPISession.instance())
         self.domino_api = DominoAPISession.instance()
 
-    @abstractmethod
     def status(self):
-        """Fetches the status of the specific task from the target Domino instance.
+        """Fetches the status of the specific task from the target Domino instance. Must be
+        implemented by all task types.
         """
-        return
+        raise NotImplementedError
 
-    @abstractmethod
     def submit(self):
-        """Submits the task for execution on the target Domino instance.
+        """Submits the task for execution on the target Domino instance. Must be implemented by
+        all task types.
+        """
+        raise NotImplementedError
+
+    def resolve_hardware_tier(self):
+        """Resolves the hardware tier of the task ahead of its submission.
+
+        DagBuilder calls this once the graph is built, so that misspelled tier names are reported
+        before anything is submitted, and submit() doesn't have to look the tier up. The base
+        implementation does nothing.
+
+        Returns
+        -------
+        hw_tier_id : str
+              Domino hardware tier ID, or None if the task doesn't need one.
+        """
+        return None
+
+    async def submit_async(self, executor=None):
+        """Submits the task without blocking the event loop.
+
+        python-domino is synchronous, so the submission runs in an executor. This lets asyncio
+        based callers submit many tasks concurrently, e.g.
+        ``await asyncio.gather(*(task.submit_async() for task in tasks))``.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, default=None
+              Executor running the submission. The default executor of the event loop is used if not set.
+
+        Returns
+        -------
+        The return value of submit().
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.submit)
+
+    async def status_async(self, executor=None):
+        """Fetches the status of the task without blocking the event loop.
+
+        Like submit_async(), the blocking status() call runs in an executor, so polling many tasks
+        with ``await asyncio.gather(*(task.status_async() for task in tasks))`` takes roughly one
+        round trip instead of one per task.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, default=None
+              Executor running the status query. The default executor of the event loop is used if not set.
+
+        Returns
+        -------
+        str : The current status of the task (see status()).
+        """
+        if self._is_terminal():
+            # Nothing to fetch, skip the round trip through the executor
+            return self._status
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.status)
+
+    @classmethod
+    def batch_statuses(cls, tasks):
+        """Fetches the API statuses of multiple tasks of this type using a single API call.
+
+        Parameters
+        ----------
+        tasks : list of DominoTask
+              Tasks of the current type.
+
+        Returns
+        -------
+        dict : API statuses keyed by the relevant execution id. The base implementation
+               returns an empty dict, so that every task falls back to fetching its own status.
+        """
+        return {}
+
+    @staticmethod
+    def status_batch(tasks, executor=None):
+        """Fetches the status of multiple tasks, issuing as few API calls as possible.
+
+        Tasks are grouped by type and each group issues a single batch_statuses() call. The
+        results are cached on the tasks, so only the tasks that are not covered by the batch
+        query their status individually.
+
+        Parameters
+        ----------
+        tasks : iterable of DominoTask
+              Tasks of any type.
+        executor : concurrent.futures.Executor, default=None
+              Executor used for fetching the remaining statuses concurrently. If not set,
+              statuses are fetched sequentially.
+
+        Returns
+        -------
+        dict : The current status of each task, keyed by task_id.
+        """
+        tasks = list(tasks)
+        tasks_by_type = {}
+        for task in tasks:
+            tasks_by_type.setdefault(type(task), []).append(task)
+
+        for task_type, tasks_of_type in tasks_by_type.items():
+            task_type.refresh_many(tasks_of_type)
+
+        if executor:
+            # Statuses are independent REST calls, so fetch them concurrently
+            futures = {task.task_id: executor.submit(task.status) for task in tasks}
+            return {task_id: future.result() for task_id, future in futures.items()}
+
+        return {task.task_id: task.status() for task in tasks}
+
+    @staticmethod
+    def submit_many(tasks, executor=None, max_parallel=16):
+        """Submits multiple tasks concurrently.
+
+        The Domino API has no bulk submission endpoint, so each task is still submitted with its
+        own request, but the requests are issued in parallel. Tasks whose type sets SERIAL_SUBMISSION
+        (e.g. apps) are submitted one at a time instead. A task whose submission raises an
+        exception is logged and marked as failed, without affecting the remaining submissions.
+
+        Parameters
+        ----------
+        tasks : iterable of DominoTask
+              Tasks of any type.
+        executor : concurrent.futures.Executor, default=None
+              Executor used for the submissions. If not set, a temporary ThreadPoolExecutor
+              with up to max_parallel workers is used.
+        max_parallel : int, default=16
+              Maximum number of concurrent submissions when no executor is provided.
+
+        Returns
+        -------
+        dict : The exceptions raised by failed submissions, keyed by task_id.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return {}
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=min(max_parallel, len(tasks))) as pool:
+                return DominoTask.submit_many(tasks, executor=pool)
+
+        errors = {}
+
+        def fail(task, e):
+            task.log.exception("Submission of task %s failed.", task.task_id)
+            task.set_status(DominoTask.STAT_FAILED)
+            errors[task.task_id] = e
+
+        futures = [(task, executor.submit(task.submit)) for task in tasks if not task.SERIAL_SUBMISSION]
+
+        # Submitted in the calling thread while the parallel submissions are in flight
+        for task in tasks:
+            if task.SERIAL_SUBMISSION:
+                try:
+                    task.submit()
+                except Exception as e:
+                    fail(task, e)
+
+        for task, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                fail(task, e)
+
+        return errors
+
+    @classmethod
+    def refresh_many(cls, tasks):
+        """Refreshes the status of multiple tasks of this type using a single batch_statuses() call,
+        and distributes the results to the individual tasks. Tasks that are not covered by the batch
+        response keep fetching their status through status().
+
+        Parameters
+        ----------
+        tasks : list of DominoTask
+              Tasks of the current type.
+        """
+        api_statuses = cls.batch_statuses(tasks)
+        if api_statuses:
+            for task in tasks:
+                task.set_status_from(api_statuses)
+
+    def set_status_from(self, api_statuses):
+        """Pre-populates the task status from the result of batch_statuses(). If the task is
+        present in api_statuses, status() won't query the Domino API until the next poll is due.
+
+        Parameters
+        ----------
+        api_statuses : dict
+              API statuses as returned by batch_statuses().
         """
         return
 
+    def refresh_status(self, status):
+        """Sets the status of the task as reported by the Domino API.
+
+        The status is cached and returned by status() without querying the API until the next
+        poll is due. The polling interval is halved if the status has changed, and grows by 50%
+        (up to MAX_POLL_INTERVAL) if it hasn't.
+
+        Parameters
+        ----------
+        status : {STAT_UNSUBMITTED, STAT_SUCCEEDED, STAT_INPROGRESS, STAT_FAILED}
+              Status of the current task.
+        """
+        old_status = self._status
+        self.set_status(status)
+        self._cached_at = time.monotonic()
+
+        if status is old_status:
+            self._poll_interval = min(self._poll_interval * 1.5, self.MAX_POLL_INTERVAL)
+        else:
+            self._poll_interval = max(self._poll_interval / 2, self.MIN_POLL_INTERVAL)
+
+    def _get_status_json(self, url):
+        """Fetches a status document from the Domino API with a conditional GET.
+
+        If the previous response carried an ETag, it is sent back in If-None-Match. When the
+        API answers with 304 Not Modified the status hasn't changed, so the body is neither
+        downloaded nor parsed.
+
+        Parameters
+        ----------
+        url : str
+              URL of the status endpoint.
+
+        Returns
+        -------
+        dict : The parsed response, or None if the status hasn't changed since the last request.
+        """
+        headers = {"If-None-Match": self._etag} if self._etag else None
+        response = self.domino_api.request_manager.get(url, headers=headers)
+        if response.status_code == 304:
+            return None
+
+        self._etag = response.headers.get("ETag")
+        return parse_json(response)
+
+    def _is_status_cached(self):
+        """Checks if the last status received from the Domino API is still current.
+        """
+        return self._cached_at is not None and time.monotonic() - self._cached_at < self._poll_interval
+
+    def _is_terminal(self):
+        """Checks if the task has succeeded or failed. The status of such a task won't change
+        (unless it is resubmitted), so there is no need to poll the Domino API for it.
+        """
+        return self._status is self.STAT_SUCCEEDED or self._status is self.STAT_FAILED
+
     def set_status(self, status):
         """Sets the internal status of the task.
 
@@ -71,10 +368,24 @@ class DominoTask(metaclass=ABCMeta):
         ----------
         status : {STAT_UNSUBMITTED, STAT_SUCCEEDED, STAT_INPROGRESS, STAT_FAILED}
               Status of the current task.
+
+        Raises
+        ------
+        ValueError
+            If status is not one of the VALID_STATES.
+        RuntimeError
+            If the task can't transition from its current status to the new one (see TRANSITIONS).
         """
-        assert status in self.VALID_STATES, "%s status is an Invalid state" % status
+        if status not in self.VALID_STATES:
+            raise ValueError("{0} status is an invalid state".format(status))
+        old_status = self._status
+        if status is not old_status and status not in self.TRANSITIONS[old_status]:
+            raise RuntimeError("Invalid status transition for task {0}: {1} -> {2}".format(self.task_id, old_status, status))
         self._status = status
 
+        if status is not old_status and self.on_status_change is not None:
+            self.on_status_change(self, old_status, status)
+
     def is_complete(self):
         """Checks if the task has completed successfully
 
@@ -82,7 +393,53 @@ class DominoTask(metaclass=ABCMeta):
         -------
         True : if the task's internal status is STAT_SUCCEEDED
         """
-        return self.status() == self.STAT_SUCCEEDED
+        return self.status() is self.STAT_SUCCEEDED
+
+    def wait_until_complete(self, timeout=None, initial_interval=1.0, max_interval=30.0):
+        """Blocks until a submitted task succeeds or fails.
+
+        The Domino API doesn't offer long-polling for execution statuses, so the status is polled
+        with a jittered exponential backoff -- frequently at first, as short tasks often finish quickly,
+        and about every max_interval seconds for long running tasks.
+
+        Parameters
+        ----------
+        timeout : float, default=None
+              Maximum number of seconds to wait. Waits indefinitely if not set.
+        initial_interval : float, default=1.0
+              Number of seconds to wait before the second status check.
+        max_interval : float, default=30.0
+              Maximum number of seconds between two status checks.
+
+        Returns
+        -------
+        bool : True if the task has succeeded, False if it has failed or the timeout has expired.
+
+        Raises
+        ------
+        RuntimeError
+            If the task hasn't been submitted (its status would never change).
+        """
+        if self._status is self.STAT_UNSUBMITTED:
+            raise RuntimeError("Task {0} has not been submitted. Call submit() before waiting for it.".format(self.task_id))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        attempt = 0
+
+        while True:
+            status = self.status()
+            if status is self.STAT_SUCCEEDED or status is self.STAT_FAILED:
+                return status is self.STAT_SUCCEEDED
+
+            wait = jittered_backoff(attempt, base=initial_interval, cap=max_interval, factor=1.5)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+            attempt += 1
 
 
 class DominoSchedRun(DominoTask):
@@ -133,14 +490,27 @@ class DominoSchedRun(DominoTask):
     The `Scheduled Jobs <https://docs.dominodatalab.com/en/latest/user_guide/5dce1f/scheduled-jobs/>`_ section in the Domino Documentation.
     """
 
-    def __init__(self, task_id, command, cron_string, title=None, tier=None, environment_id=None, submit_as_running_user=False, deploy_by_name=False):
-        super(self.__class__, self).__init__(task_id)
+    __slots__ = ("command", "cron_string", "tier", "title", "environment_id", "deploy_by_name", "username",
+                 "_tier_id")
 
-        self.log = logging.getLogger(__name__)
+    # Static part of the scheduled job request. The values are never modified, so they can be
+    # shared by all requests.
+    _REQUEST_TEMPLATE = {
+        # Always use the active revision of the CE
+        "environmentRevisionSpec": "ActiveRevision",
+        "notifyOnCompleteEmailAddresses": [],
+        "isPaused": False,
+        "publishAfterCompleted": False,
+        "allowConcurrentExecution": False
+    }
+
+    def __init__(self, task_id, command, cron_string, title=None, tier=None, environment_id=None, submit_as_running_user=False, deploy_by_name=False):
+        super().__init__(task_id)
 
         # the API expects a string here (scheduled jobs are always direct jobs)
         self.command = command[0]
         self.tier = tier
+        self._tier_id = None
         self.cron_string = cron_string
         self.environment_id = environment_id
         self.deploy_by_name = deploy_by_name
@@ -160,82 +530,79 @@ class DominoSchedRun(DominoTask):
         else:
             self.title = task_id
 
-    def set_status(self, status):
-        """Sets the internal status of the task.
-        """
-        assert status in self.VALID_STATES, "%s status is an Invalid state" % status
-        self._status = status
-
-    def is_complete(self):
-        """Checks the task status and returns true if it is STAT_SUCCEEDED
-        """
-        return self.status() == self.STAT_SUCCEEDED
-
     def status(self):
         # This is a blocking call - no need to poll for status.
         return self._status
 
+    def resolve_hardware_tier(self):
+        if self._tier_id is None:
+            if self.tier:
+                self._tier_id = get_hardware_tier_id(self.tier)
+                if not self._tier_id:
+                    raise ValueError(
+                        "Hardware tier ID for tier name {} cannot be fetched. Misspelled tier name?".format(self.tier))
+            else:
+                # If no tier override is set, use the default HW tier for the project
+                self._tier_id = get_default_hardware_tier()
+
+        return self._tier_id
+
     def submit(self):
         response_json = None
 
-        # If no tier override is set, use the default HW tier for the project
-        if self.tier:
-            tier_id = get_hardware_tier_id(self.tier)
-        else:
-            tier_id = get_default_hardware_tier()
+        tier_id = self.resolve_hardware_tier()
 
-        self.log.info(
-            "-- Submitting scheduled job {0} --".format(self.task_id))
-        self.log.info("Title           : {}".format(self.title))
-        self.log.info("Command         : {}".format(self.command))
-        if self.environment_id:
-            self.log.info("Environment     : {}".format(self.environment_id))
-        self.log.info("Cron string     : {}".format(self.cron_string))
-        if self.tier:
-            self.log.info("Tier            : {}".format(self.tier))
-
-        self.log.info("Scheduling user : {}".format(self.username))
+        # A single record, so that concurrent submissions don't interleave their log lines
+        self.log.info("-- Submitting scheduled job %s --\n"
+                      "Title           : %s\n"
+                      "Command         : %s\n"
+                      "Environment     : %s\n"
+                      "Cron string     : %s\n"
+                      "Tier            : %s\n"
+                      "Scheduling user : %s",
+                      self.task_id, self.title, self.command, self.environment_id, self.cron_string, self.tier,
+                      self.username)
 
         project_id = self.domino_api.project_id
-        
+        jobs_url = self.domino_api._routes.host + "/v4/projects/" + project_id + "/scheduledjobs"
+
         # Get the scheduling user's id 
         user_id = self.domino_api.get_user_id(self.username)
         if user_id is None:
             self.set_status(self.STAT_FAILED)
-            self.log.error("User override set, but no user {} exists in the Domino instance.".format(self.username))
+            self.log.error("User override set, but no user %s exists in the Domino instance.", self.username)
             return None
 
         if self.deploy_by_name:
-            self.log.warn("This is a deploy_by_name regime. Trying to look up an existing job named {}".format(self.title))
-            url = self.domino_api._routes.host + "/v4/projects/" + project_id + "/scheduledjobs"
-            jobs = self.domino_api.request_manager.get(url).json()
+            self.log.warning("This is a deploy_by_name regime. Trying to look up an existing job named %s", self.title)
+            jobs = parse_json(self.domino_api.request_manager.get(jobs_url))
             job_id = None
             for job in jobs:
                 if (job["title"] == self.title):
                     if job_id:
                         self.set_status(self.STAT_FAILED)
-                        self.log.error("Found multiple jobs named {}. Cannot deploy by name.")
+                        self.log.error("Found multiple jobs named %s. Cannot deploy by name.", self.title)
                         return None
                     else:
                         job_id = job["id"]
-                        self.log.info("Found id for job {0}: {1}".format(self.title, job_id))
+                        self.log.info("Found id for job %s: %s", self.title, job_id)
             
             if job_id:
-                url = url + "/" + job_id
-                response = self.domino_api.request_manager.delete(url)
+                response = self.domino_api.request_manager.delete(jobs_url + "/" + job_id)
                 if response.status_code == 200:
-                    self.log.info("Job with id {} successfully unscheduled.".format(job_id))
+                    self.log.info("Job with id %s successfully unscheduled.", job_id)
                 else:
                     self.set_status(self.STAT_FAILED)
-                    self.log.error("Unscheduling of job with id {0} failed. API response code is {1}.".format(job_id, response.status_code))
+                    self.log.error("Unscheduling of job with id %s failed. API response code is %s.", job_id, response.status_code)
                     return None
             else:
-                self.log.warn("deploy_by_name is set, but no job with title {} exists.".format(self.title))
+                self.log.warning("deploy_by_name is set, but no job with title %s exists.", self.title)
 
         # We need the local TZ for scheduling
         local_tz = get_local_timezone()
 
         request = {
+            **self._REQUEST_TEMPLATE,
             "title": self.title,
             "command": self.command,
             "schedule": {
@@ -243,31 +610,24 @@ class DominoSchedRun(DominoTask):
                 "isCustom": True
             },
             "hardwareTierIdentifier": tier_id,
-            # Always use the active revision of the CE
-            "environmentRevisionSpec": "ActiveRevision",
-            "notifyOnCompleteEmailAddresses": [],
-            "isPaused": False,
             "timezoneId": local_tz,  # "Europe/London",
-            "publishAfterCompleted": False,
-            "allowConcurrentExecution": False,
             "scheduledByUserId": user_id,
             "overrideEnvironmentId": self.environment_id
         }
 
+        # Expected failures are request errors (requests exceptions are IOErrors), invalid JSON,
+        # or a response without a job id
         try:
-            url = self.domino_api._routes.host + \
-                "/v4/projects/" + project_id + "/scheduledjobs"
-            response_json = self.domino_api.request_manager.post(
-                url, json=request).json()
+            response_json = parse_json(self.domino_api.request_manager.post(
+                jobs_url, json=request))
             job_id = response_json["id"]
-            self.log.info("Submission of scheduled job {} succeeded. Job id is {}".format(
-                self.task_id, job_id))
-            self.set_status(self.STAT_SUCCEEDED)
-        except:
+        except (OSError, ValueError, KeyError) as e:
             self.set_status(self.STAT_FAILED)
-            self.log.error(
-                "Submission of scheduled job {} failed.".format(self.task_id))
-            response_json = None
+            self.log.error("Submission of scheduled job %s failed: %s", self.task_id, e)
+            return None
+
+        self.log.info("Submission of scheduled job %s succeeded. Job id is %s", self.task_id, job_id)
+        self.set_status(self.STAT_SUCCEEDED)
 
         return response_json
 
@@ -289,6 +649,8 @@ class DominoRun(DominoTask):
             Whether this command should be passed directly to a shell
     mas_retries : int, default=0
             Number of maximum retries if the original run fails. Once max_retries is reached, the entire task is placed in a failed state.
+            Submissions that fail before the run could have been started (failed connection attempts, or 429 and 503 responses)
+            are retried with an exponential backoff and count against the same limit.
     tier : str
             The hardware tier to use for the execution. This is the human-readable name of the hardware tier, such as "Free", "Small", or "Medium". 
             If not provided, the project's default tier is used.
@@ -300,10 +662,31 @@ class DominoRun(DominoTask):
     The `Jobs <https://docs.dominodatalab.com/en/latest/user_guide/942549/jobs/>`_ section in the Domino Documentation.
     """
 
-    def __init__(self, task_id, command, isDirect=False, max_retries=0, tier=None, title=None):
-        super(self.__class__, self).__init__(task_id)
+    __slots__ = ("command", "isDirect", "tier", "title", "run_id")
+
+    # Maps run statuses reported by the Domino API to internal statuses
+    _API_STATUS_MAP = MappingProxyType({
+        "succeeded": DominoTask.STAT_SUCCEEDED,
+        "error": DominoTask.STAT_FAILED,
+        "failed": DominoTask.STAT_FAILED,
+        "preparing": DominoTask.STAT_INPROGRESS,
+        "running": DominoTask.STAT_INPROGRESS,
+        "pending": DominoTask.STAT_INPROGRESS,
+        "finishing": DominoTask.STAT_INPROGRESS,
+    })
+
+    # Upper bound (in seconds) of the backoff between failed submission attempts
+    SUBMIT_MAX_BACKOFF = 30
+
+    # Error responses to a submission which guarantee that the run hasn't been started
+    _SUBMIT_RETRY_STATUSES = frozenset((429, 503))
 
-        self.log = logging.getLogger(__name__)
+    # Runs range from seconds to hours
+    MIN_POLL_INTERVAL = 2.0
+    MAX_POLL_INTERVAL = 30.0
+
+    def __init__(self, task_id, command, isDirect=False, max_retries=0, tier=None, title=None):
+        super().__init__(task_id)
 
         self.command = command
         self.isDirect = isDirect
@@ -312,49 +695,110 @@ class DominoRun(DominoTask):
         self.title = title
         self.run_id = None
         self.retries = 0
+        self.can_retry = max_retries > 0
+
+    @classmethod
+    def batch_statuses(cls, tasks):
+        # Only the runs that are due for a status update
+        run_ids = set(task.run_id for task in tasks
+                      if task.run_id and not task._is_terminal() and not task._is_status_cached())
+        return DominoAPISession.runs_status_bulk(run_ids)
+
+    def set_status_from(self, api_statuses):
+        api_status = api_statuses.get(self.run_id)
+        if api_status and not self._is_terminal():
+            self.refresh_status(self._translate_status(api_status))
 
     def status(self):
-        if self.run_id:
+        if self.run_id and not self._is_terminal() and not self._is_status_cached():
             # Task has been submitted
             # Update status
             api_status = self.domino_api.runs_status(
-                self.run_id)["status"].lower()  # needs error handling?
-            if api_status == "succeeded":
-                self.set_status(self.STAT_SUCCEEDED)
-            elif api_status in ("error", "failed"):
-                self.set_status(self.STAT_FAILED)
-            elif api_status in ("preparing", "running", "pending", "finishing"):
-                self.set_status(self.STAT_INPROGRESS)
-            else:
-                raise RuntimeError("Unknown DominoRun status:", api_status)
+                self.run_id)["status"]  # needs error handling?
+            self.refresh_status(self._translate_status(api_status))
 
         return self._status
 
+    def _translate_status(self, api_status):
+        # Maps a run status reported by the Domino API to an internal status
+        try:
+            return self._API_STATUS_MAP[api_status.lower()]
+        except KeyError:
+            raise RuntimeError("Unknown DominoRun status:", api_status)
+
     def submit(self):
         response_json = None
 
-        self.log.info("-- Submitting run {0} --".format(self.task_id))
-        self.log.info("Direct task   : {}".format(self.isDirect))
-        self.log.info("Command       : {}".format(self.command))
-
-        try:
-            if self.tier:
-                # Catch errors (e.g. invalid hw tier etc.)
-                response_json = self.domino_api.runs_start(
-                    self.command, isDirect=self.isDirect, tier=self.tier, title=self.title)
-                self.log.info("Tier override : {}".format(self.tier))
-            else:
-                response_json = self.domino_api.runs_start(
-                    self.command, isDirect=self.isDirect, title=self.title)
-            self.run_id = response_json["runId"]
-            self._status = DominoTask.STAT_INPROGRESS
-        except Exception as e:
-            self._status = DominoTask.STAT_FAILED
-            self.log.error(
-                "Submission of task {} failed.".format(self.task_id))
-            self.log.exception(e)
-
-        return response_json
+        # Resubmitting a failed run counts against max_retries
+        if self._status is DominoTask.STAT_FAILED:
+            self.retries += 1
+            self.can_retry = self.retries < self.max_retries
+
+        # A single record, so that concurrent submissions don't interleave their log lines
+        self.log.info("-- Submitting run %s --\n"
+                      "Direct task   : %s\n"
+                      "Command       : %s\n"
+                      "Tier override : %s",
+                      self.task_id, self.isDirect, self.command, self.tier)
+
+        while True:
+            try:
+                if self.tier:
+                    # Catch errors (e.g. invalid hw tier etc.)
+                    response_json = self.domino_api.runs_start(
+                        self.command, isDirect=self.isDirect, tier=self.tier, title=self.title)
+                else:
+                    response_json = self.domino_api.runs_start(
+                        self.command, isDirect=self.isDirect, title=self.title)
+                self.run_id = response_json["runId"]
+                self.set_status(DominoTask.STAT_INPROGRESS)
+                return response_json
+            except ValueError as e:
+                # Malformed response (requests' JSONDecodeError derives from both ValueError and OSError).
+                # The run may have been started anyway, so resubmitting could start a duplicate.
+                self._fail_submission(e)
+                return response_json
+            except OSError as e:
+                # Connection and HTTP errors (the requests exceptions derive from OSError). Transient
+                # ones are retried here, with an exponential backoff, as long as retries are left.
+                if not (self.can_retry and self._is_transient_error(e)):
+                    self._fail_submission(e)
+                    return response_json
+                self.retries += 1
+                self.can_retry = self.retries < self.max_retries
+                delay = jittered_backoff(self.retries, cap=self.SUBMIT_MAX_BACKOFF)
+                self.log.warning("Submission of task %s failed (%s). Retrying in %.1f seconds (retry %s of %s)...",
+                                 self.task_id, e, delay, self.retries, self.max_retries)
+                time.sleep(delay)
+            except Exception as e:
+                self._fail_submission(e)
+                return response_json
+
+    @classmethod
+    def _is_transient_error(cls, e):
+        # Only failures that guarantee the run hasn't been started are retried - throttled (429) and
+        # unavailable (503) responses, and errors raised before a connection was established. Gateway
+        # errors (502/504), read timeouts and connections dropped after the request was sent may come
+        # after Domino has started the run, so resubmitting could start a duplicate. Anything else
+        # (e.g. a 4xx response) will fail the same way again. Note that the API session doesn't retry
+        # POST requests on error responses, so these retries are the only ones.
+        response = getattr(e, "response", None)
+        if response is not None:
+            return response.status_code in cls._SUBMIT_RETRY_STATUSES
+
+        from requests.exceptions import ConnectTimeout
+        from urllib3.exceptions import NewConnectionError
+        if isinstance(e, (ConnectionRefusedError, ConnectTimeout, NewConnectionError)):
+            return True
+
+        # requests wraps the urllib3 error, i.e. ConnectionError(MaxRetryError(reason=NewConnectionError))
+        reason = getattr(e.args[0], "reason", None) if e.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _fail_submission(self, e):
+        self.set_status(DominoTask.STAT_FAILED)
+        self.log.error("Submission of task %s failed.", self.task_id)
+        self.log.exception(e)
 
 
 class DominoModel(DominoTask):
@@ -396,16 +840,39 @@ class DominoModel(DominoTask):
     The `Model APIs <https://docs.dominodatalab.com/en/latest/user_guide/8dbc91/model-apis/>`_ section in the Domino Documentation.
     """
 
-    def __init__(self, task_id, file_name, function_name, model_name, description="", model_id=None, environment_id=None, deploy_by_name=False):
-        super(self.__class__, self).__init__(task_id)
+    __slots__ = ("file_name", "function_name", "model_name", "description", "model_id", "version_id",
+                 "environment_id", "deploy_by_name", "_status_url",
+                 "_deployment_status_url", "_build_complete")
 
-        self.log = logging.getLogger(__name__)
+    # Maps model deployment statuses reported by the Domino API to internal statuses. Unknown
+    # statuses (e.g. starting or stopping) are treated as in progress.
+    _API_STATUS_MAP = MappingProxyType({
+        "running": DominoTask.STAT_SUCCEEDED,
+        "failed": DominoTask.STAT_FAILED,
+    })
+
+    # Model build statuses which mean that the build has failed. Besides these, only "complete" is
+    # final -- any other status means the model is still building.
+    _FAILED_BUILD_STATUSES = frozenset(("failed", "error"))
+
+    # Model builds and deployments take minutes
+    MIN_POLL_INTERVAL = 10.0
+    MAX_POLL_INTERVAL = 60.0
+
+    # Keys (in order of preference) that may hold the id of the new version in the data of a publish
+    # response. Publishing a version returns the version itself, while publishing a new model returns
+    # the model, whose _id is the model id.
+    _VERSION_ID_KEYS = ("_id", "versionId")
+    _NEW_MODEL_VERSION_ID_KEYS = ("activeVersionId", "versionId")
+
+    def __init__(self, task_id, file_name, function_name, model_name, description="", model_id=None, environment_id=None, deploy_by_name=False):
+        super().__init__(task_id)
 
         if environment_id == None:
             # No environment provided for the model. Pick the first global environment
             self.environment_id = self.get_global_envs()[0].get("id")
-            self.log.warn("No environment provided for model {0}. Automatically selecting the first Global environment: {1}".format(
-                self, task_id, self.environment_id))
+            self.log.warning("No environment provided for model %s. Automatically selecting the first Global environment: %s",
+                             task_id, self.environment_id)
         else:
             self.environment_id = environment_id
 
@@ -416,50 +883,65 @@ class DominoModel(DominoTask):
         self.model_id = model_id
         self.version_id = None
         self.deploy_by_name = deploy_by_name
+        self._status_url = None
+        self._deployment_status_url = None
+        self._build_complete = False
 
         if (self.deploy_by_name and self.model_id):
-            self.log.warn("Both deploy_by_name and model_id are set. Ignoring model_id.")
+            self.log.warning("Both deploy_by_name and model_id are set. Ignoring model_id.")
             self.model_id = None
             
 
     def status(self):
-        if (self._status != DominoTask.STAT_UNSUBMITTED and self._status != DominoTask.STAT_FAILED):
+        if self._status is DominoTask.STAT_INPROGRESS and not self._is_status_cached():
             assert self.model_id != None, "This shouldn't happen. Task is marked as submitted but has no model_id?"
-            # If the task has been submitted, update its status
-            url = self.domino_api._routes._build_models_v4_url() + "/" + self.model_id + \
-                "/" + self.version_id + "/getBuildStatus"
-
-            api_status = self.domino_api.request_manager.get(url).json()[
-                "status"].lower()
-
-            if api_status == "building":
-                status = self.STAT_INPROGRESS
-            elif api_status == "complete":
-                # This is only the build status. If we want to make sure that the model is up and running we need to check
-                # /v4/models/model_id/version_id/getModelDeploymentStatus for "status":"running"
-                status = self.STAT_SUCCEEDED
+            # If the task has been submitted, update its status. The model is complete once it is up and running,
+            # which takes two steps - the build and the deployment. Once the build is complete, only the deployment
+            # status is polled.
+            if not self._build_complete:
+                response = self._get_status_json(self._status_url)
+                build_status = None if response is None else response["status"].lower()
+                if build_status in self._FAILED_BUILD_STATUSES:
+                    self.refresh_status(self.STAT_FAILED)
+                    return self._status
+                if build_status != "complete":
+                    # Still building (or not modified since the last poll)
+                    self.refresh_status(self.STAT_INPROGRESS)
+                    return self._status
+
+                self._build_complete = True
+                self._status_url = self._deployment_status_url
+                self._etag = None
+
+            response = self._get_status_json(self._status_url)
+            if response is None:
+                # Not modified since the last poll
+                self.refresh_status(self._status)
             else:
-                status = self.STAT_INPROGRESS
-            self.set_status(status)
+                api_status = response["status"].lower()
+                self.refresh_status(self._API_STATUS_MAP.get(api_status, self.STAT_INPROGRESS))
 
         return self._status
 
-    def get_global_envs(self):
-        """Fetches all globally available compute environments.
+    @classmethod
+    def get_global_envs(cls):
+        """Fetches all globally available compute environments. The list is cached by
+        DominoAPISession for a minute, so it is shared by all model tasks.
 
         Returns
         -------
         list of str : List of all globally available compute environments
         """
-        all_available_environments = self.domino_api.environments_list()
-        global_environments = list(
-            filter(
-                lambda x: x.get(
-                    "visibility") == "Global", all_available_environments["data"]
-            )
-        )
+        return DominoAPISession.global_environments()
 
-        return global_environments
+    @staticmethod
+    def _version_id_from(response_json, keys):
+        # Returns the first version id found in the data of a publish response, or None
+        data = response_json.get("data", {})
+        for key in keys:
+            if data.get(key):
+                return data[key]
+        return None
 
     def get_versions(self):
         """Gets all versions of a specific model. The id of the queried model is fetched from self.model_id.
@@ -472,25 +954,27 @@ class DominoModel(DominoTask):
 
         url = self.domino_api._routes._build_models_url() + "/" + \
             self.model_id + "/versions"
-        response_json = self.domino_api.request_manager.get(url).json()
+        response_json = parse_json(self.domino_api.request_manager.get(url))
         return response_json.get("data", {})
 
     def submit(self):
         response_json = None
 
-        self.log.info("-- Submitting model {0} --".format(self.task_id))
-        self.log.info("Environment : {}".format(self.environment_id))
-        self.log.info("Function    : {}".format(self.function_name))
-        self.log.info("File        : {}".format(self.file_name))
-        self.log.info("Model name  : {}".format(self.model_name))
-        if self.model_id:
-            self.log.info("Model ID    : {}".format(self.model_id))
+        # A single record, so that concurrent submissions don't interleave their log lines
+        self.log.info("-- Submitting model %s --\n"
+                      "Environment : %s\n"
+                      "Function    : %s\n"
+                      "File        : %s\n"
+                      "Model name  : %s\n"
+                      "Model ID    : %s",
+                      self.task_id, self.environment_id, self.function_name, self.file_name, self.model_name,
+                      self.model_id)
 
         if self.deploy_by_name:
             # we need to do an update by name
             # first, fetch all models in the current project
             url = self.domino_api._routes.models_list()
-            response = self.domino_api.request_manager.get(url).json()
+            response = parse_json(self.domino_api.request_manager.get(url))
 
             # iterate over all models and see if there is a match
             models = response.get("data", None)
@@ -502,7 +986,7 @@ class DominoModel(DominoTask):
                     if self.model_id:
                         # already have a model_id? that's a duplicate then
                         self.log.error("deploy_by_name is set, but the current project has multiple models with the same name. Task aborting...")
-                        self._status = DominoTask.STAT_FAILED
+                        self.set_status(DominoTask.STAT_FAILED)
                         return
                     else:
                         self.model_id = model["id"]
@@ -514,21 +998,33 @@ class DominoModel(DominoTask):
 
             response_json = self.domino_api.model_version_publish(model_id=self.model_id, file=self.file_name, function=self.function_name,
                                                                   environment_id=self.environment_id, description=self.description)
+            # The response describes the newly created version
+            self.version_id = self._version_id_from(response_json, self._VERSION_ID_KEYS)
         else:
             # no model_id, this is a new model deploy
             response_json = self.domino_api.model_publish(file=self.file_name, function=self.function_name, environment_id=self.environment_id,
                                                           name=self.model_name, description=self.description)
             # Set the model_id and version_id
             self.model_id = response_json.get("data", {}).get("_id")
+            self.version_id = self._version_id_from(response_json, self._NEW_MODEL_VERSION_ID_KEYS)
+
+        if not self.version_id:
+            # Version not included in the response, look up the most recent one
+            versions = self.get_versions()
+            self.version_id = versions[0].get("_id")
 
-        versions = self.get_versions()
-        self.version_id = versions[0].get("_id")
+        # The status URLs only depend on the model and version, so build them once here
+        # rather than on every status() poll
+        version_url = self.domino_api._routes._build_models_v4_url() + "/" + self.model_id + "/" + self.version_id
+        self._status_url = version_url + "/getBuildStatus"
+        self._deployment_status_url = version_url + "/getModelDeploymentStatus"
+        self._build_complete = False
+        self._etag = None
 
-        self.log.info("Created a model with model_id {0} and model_version {1}".format(
-            self.model_id, self.version_id))
+        self.log.info("Created a model with model_id %s and model_version %s", self.model_id, self.version_id)
 
-        self._status = DominoTask.STAT_INPROGRESS
-        self.log.info(20*"-")
+        self.set_status(DominoTask.STAT_INPROGRESS)
+        self.log.info(_DIVIDER)
 
         return response_json
 
@@ -560,50 +1056,94 @@ class DominoApp(DominoTask):
     The `Domino Apps <https://docs.dominodatalab.com/en/latest/user_guide/8b094b/domino-apps/>`_ section in the Domino Documentation.
     """
 
-    def __init__(self, task_id, app_name, tier=None, description=None):
-        super(self.__class__, self).__init__(task_id)
+    __slots__ = ("app_name", "tier", "description", "app_id", "_status_url", "_tier_id")
+
+    # Maps app statuses reported by the Domino API to internal statuses. The task is complete as
+    # soon as the app is running.
+    _API_STATUS_MAP = MappingProxyType({
+        "running": DominoTask.STAT_SUCCEEDED,
+        "error": DominoTask.STAT_FAILED,
+        "failed": DominoTask.STAT_FAILED,
+        "preparing": DominoTask.STAT_INPROGRESS,
+        "pending": DominoTask.STAT_INPROGRESS,
+        "finishing": DominoTask.STAT_INPROGRESS,
+    })
+
+    # Apps usually start within a minute or two
+    MIN_POLL_INTERVAL = 5.0
+    MAX_POLL_INTERVAL = 30.0
+
+    # Domino allows a single app per project, and submitting an app unpublishes the running one.
+    # Concurrent submissions would race on that, so apps are submitted one at a time.
+    SERIAL_SUBMISSION = True
+
+    # Static part of the app creation request. The values are never modified, so they can be
+    # shared by all requests.
+    _CREATE_REQUEST_TEMPLATE = {
+        "modelProductType": "APP",
+        "owner": "",
+        "status": "",
+        "media": [],
+        "openUrl": "",
+        "tags": [],
+        "stats": {"usageCount": 0},
+        "appExtension": {"appType": ""},
+        "id": "000000000000000000000000",
+        "permissionsData": {
+            "visibility": "GRANT_BASED",
+            "accessRequestStatuses": {},
+            "pendingInvitations": [],
+            "discoverable": True,
+            "appAccessStatus": "ALLOWED",
+        }
+    }
 
-        self.log = logging.getLogger(__name__)
+    def __init__(self, task_id, app_name, tier=None, description=None):
+        super().__init__(task_id)
 
         self.app_name = app_name
         self.tier = tier
+        self._tier_id = None
         self.description = description
+        self.app_id = None
+        self._status_url = None
 
     def status(self):
-        if (self._status != DominoTask.STAT_UNSUBMITTED):
+        if self._status is DominoTask.STAT_INPROGRESS and not self._is_status_cached():
             assert self.app_id != None, "This shouldn't happen. Task is marked as submitted but has no app_id?"
             # If the task has been submitted, update its status
+            response = self._get_status_json(self._status_url)
+            if response is None:
+                # Not modified since the last poll
+                self.refresh_status(self._status)
+                return self._status
 
-            url = self.domino_api._routes.app_get(self.app_id)
-            response = self.domino_api.request_manager.get(url).json()
             api_status = response.get("status", None).lower()
 
-            if api_status == "running":
-                self.set_status(self.STAT_SUCCEEDED)
-            elif api_status in ("error", "failed"):
-                self.set_status(self.STAT_FAILED)
-            elif api_status in ("preparing", "pending", "finishing"):
-                self.set_status(self.STAT_INPROGRESS)
-            else:
-                raise RuntimeError("Unknown DominoModel status:", api_status)
+            try:
+                self.refresh_status(self._API_STATUS_MAP[api_status])
+            except KeyError:
+                raise RuntimeError("Unknown DominoApp status:", api_status)
 
         return self._status
 
     def submit(self):
         response_json = None
 
-        self.log.info("-- Submitting app {0} --".format(self.task_id))
-        self.log.info("Name          : {}".format(self.app_name))
-        if self.tier:
-            self.log.info("Hardware tier : {}".format(self.tier))
+        # A single record, so that concurrent submissions don't interleave their log lines
+        self.log.info("-- Submitting app %s --\n"
+                      "Name          : %s\n"
+                      "Hardware tier : %s",
+                      self.task_id, self.app_name, self.tier)
 
         try:
             self.log.info("Unpublishing running apps...")
             self.domino_api.app_unpublish()
             self.log.info("Creating new app...")
             self.app_id = self._create_app()
-            self.log.info(
-                "Starting application with app_id: {}".format(self.app_id))
+            self._status_url = self.domino_api._routes.app_get(self.app_id)
+            self._etag = None
+            self.log.info("Starting application with app_id: %s", self.app_id)
             self._start_app()
             self.set_status(self.STAT_INPROGRESS)
 
@@ -611,25 +1151,29 @@ class DominoApp(DominoTask):
             self.set_status(self.STAT_FAILED)
             self.log.error(e)
 
-        self.log.info(20*"-")
-
-    def _start_app(self):
-        url = self.domino_api._routes.app_start(self.app_id)
+        self.log.info(_DIVIDER)
 
-        if self.tier:
+    def resolve_hardware_tier(self):
+        if self.tier and self._tier_id is None:
             # HW tier set. We need to get its ID
-            hw_tier_id = get_hardware_tier_id(self.tier)
-            if not hw_tier_id:
-                raise RuntimeError(
+            self._tier_id = get_hardware_tier_id(self.tier)
+            if not self._tier_id:
+                raise ValueError(
                     "Hardware tier ID for tier name {} cannot be fetched. Misspelled tier name?".format(self.tier))
 
-            request = {"hardwareTierId": hw_tier_id}
+        return self._tier_id
 
+    def _start_app(self):
+        url = self.domino_api._routes.app_start(self.app_id)
+
+        hw_tier_id = self.resolve_hardware_tier()
+        if hw_tier_id:
+            request = {"hardwareTierId": hw_tier_id}
         else:
             request = {}
 
-        response_json = self.domino_api.request_manager.post(
-            url, json=request).json()
+        response_json = parse_json(self.domino_api.request_manager.post(
+            url, json=request))
 
         return response_json
 
@@ -638,38 +1182,23 @@ class DominoApp(DominoTask):
         project_id = self.domino_api.project_id
         url = self.domino_api._routes.app_create()
 
+        now = time.time_ns()
         request_payload = {
-            "modelProductType": "APP",
+            **self._CREATE_REQUEST_TEMPLATE,
             "projectId": project_id,
             "name": self.app_name,
             "description": self.description,
-            "owner": "",
-            "created": time.time_ns(),
-            "lastUpdated": time.time_ns(),
-            "status": "",
-            "media": [],
-            "openUrl": "",
-            "tags": [],
-            "stats": {"usageCount": 0},
-            "appExtension": {"appType": ""},
-            "id": "000000000000000000000000",
-            "permissionsData": {
-                "visibility": "GRANT_BASED",
-                "accessRequestStatuses": {},
-                "pendingInvitations": [],
-                "discoverable": True,
-                "appAccessStatus": "ALLOWED",
-            }
+            "created": now,
+            "lastUpdated": now
         }
 
-        response_json = self.domino_api.request_manager.post(
-            url, json=request_payload).json()
+        response_json = parse_json(self.domino_api.request_manager.post(
+            url, json=request_payload))
 
         key = "id"
         if key in response_json.keys():
             app_id = response_json[key]
-            self.log.info(
-                "Successfully created application with app_id: {}".format(app_id))
+            self.log.info("Successfully created application with app_id: %s", app_id)
         else:
             raise RuntimeError(
                 "Cannot create application. task_id {}".format(self.task_id))
@@ -54,7 +54,7 @@ def main():
       if dag_status == Dag.DAG_SUCCEEDED:
           log.info("Pipeline completed successfully.")
       else:
-          log.warn("Pipeline terminated in {} state.".format(dag_status))
+          log.warning("Pipeline terminated in %s state.", dag_status)
  
     except RuntimeError as e:
       # TODO: Proper error handling